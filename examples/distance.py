@@ -1,10 +1,18 @@
 #!/usr/bin/env python3
 
 import tkinter as tk
+import functools
 import math
 import numpy as np
-import numpy.linalg as la
-from scipy.optimize import brentq
+
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        """Fallback when Numba is not installed: leave the function as is."""
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
 
 WIDTH = 600
 HEIGHT = 400
@@ -21,14 +29,88 @@ HELP_TEXT = "[+/-] change curve level  " \
             "[b] show bounding box"
 
 
-def ipairs(it):
-    """Make new iterator which returns rolling window of pairs from `it`."""
-    it = iter(it)
-    a = next(it)
-    while True:
-        b = next(it)
-        yield a, b
-        a = b
+# Number of line segments used to draw a curve
+SMOOTHNESS = 100
+
+# Conversion of bézier control points to power basis coefficients
+# (of t^3, t^2, t, 1), by curve level
+POWER_BASIS = {
+    2: np.array([[0, 0, 0],
+                 [1, -2, 1],
+                 [-2, 2, 0],
+                 [1, 0, 0]]),
+    3: np.array([[-1, 3, -3, 1],
+                 [3, -6, 3, 0],
+                 [-3, 3, 0, 0],
+                 [1, 0, 0, 0]]),
+}
+
+
+@njit(cache=True)
+def _forward_differences(diffs, out):
+    """Fill `out` with points of cubic polynomial curve.
+
+    `diffs` is the first point followed by its 1st, 2nd and 3rd forward
+    difference. It's updated in place.
+
+    """
+    for i in range(out.shape[0]):
+        for k in range(out.shape[1]):
+            out[i, k] = diffs[0, k]
+            diffs[0, k] += diffs[1, k]
+            diffs[1, k] += diffs[2, k]
+            diffs[2, k] += diffs[3, k]
+
+
+@functools.lru_cache(maxsize=None)
+def _difference_basis(level, segments):
+    """Conversion of bézier control points to the forward differences."""
+    h = 1 / segments
+    # Forward differences of t^3, t^2, t, 1 at t = 0 with step h
+    steps = np.array([[0, 0, 0, 1],
+                      [h*h*h, h*h, h, 0],
+                      [6*h*h*h, 2*h*h, 0, 0],
+                      [6*h*h*h, 0, 0, 0]])
+    basis = steps @ POWER_BASIS[level]
+    basis.flags.writeable = False
+    return basis
+
+
+def bezier_polyline(points, segments, out=None):
+    """Evaluate bézier curve at `segments + 1` evenly spaced points.
+
+    Uses forward differencing, which takes just three additions per point.
+    The points are written to `out` array, if given, and returned.
+
+    """
+    diffs = _difference_basis(len(points) - 1, segments) @ np.array(points, dtype=float)
+    if out is None:
+        out = np.empty((segments + 1, 2))
+    _forward_differences(diffs, out)
+    return out
+
+
+@njit("Tuple((int64, float64, float64))(float64, float64, float64)",
+      cache=True, fastmath=True)
+def _solve_quadratic(a, b, c):
+    """Quadratic formula, falls back to linear equation when a == 0.
+
+    Returns number of real roots followed by two slots for the roots.
+
+    """
+    if a == 0:
+        if b == 0:
+            return 0, 0.0, 0.0
+        return 1, -c / b, 0.0
+    disc = b * b - 4 * a * c
+    if disc < 0:
+        return 0, 0.0, 0.0
+    # Avoid cancellation by not subtracting numbers of similar magnitude
+    q = -0.5 * (b + math.copysign(math.sqrt(disc), b))
+    if q == 0:
+        # b == c == 0
+        return 2, 0.0, 0.0
+    return 2, q / a, c / q
 
 
 def solve_quadratic(a, b, c):
@@ -37,7 +119,162 @@ def solve_quadratic(a, b, c):
     a.x^2 + b.x + c = 0
 
     """
-    return [r.real for r in np.poly1d([a, b, c]).r if r.imag == 0]
+    n, *roots = _solve_quadratic(a, b, c)
+    return roots[:n]
+
+
+@njit("float64(float64, float64, float64, float64, float64)", cache=True, fastmath=True)
+def _polish_cubic_root(a, b, c, d, x):
+    """Refine approximate root of cubic equation by Newton's method.
+
+    A step is taken only if it improves the residual, so the iteration
+    can't run away near a multiple root.
+
+    """
+    y = ((a * x + b) * x + c) * x + d
+    for _ in range(2):
+        dy = (3 * a * x + 2 * b) * x + c
+        if y == 0.0 or dy == 0.0:
+            break
+        x_next = x - y / dy
+        y_next = ((a * x_next + b) * x_next + c) * x_next + d
+        if abs(y_next) >= abs(y):
+            break
+        x, y = x_next, y_next
+    return x
+
+
+@njit("Tuple((int64, float64, float64, float64))(float64, float64, float64, float64)",
+      cache=True, fastmath=True)
+def _solve_cubic(a, b, c, d):
+    """Cardano's method, falls back to quadratic equation when a == 0.
+
+    Only one root is taken from the closed form - the one of largest
+    magnitude in the depressed cubic, which doesn't suffer from cancellation.
+    It's polished on the original coefficients and divided out, the other
+    two roots are then roots of the remaining quadratic. This keeps the roots
+    accurate even when the leading coefficient is tiny.
+
+    Returns number of real roots followed by three slots for the roots.
+
+    """
+    if a == 0:
+        n, r0, r1 = _solve_quadratic(b, c, d)
+        return n, r0, r1, 0.0
+    # Substitute x = y - b/3a to get depressed cubic: y^3 + p.y + q = 0
+    shift = b / a / 3
+    p3 = (c / a - b / a * shift) / 3
+    q2 = (2 * shift * shift * shift - c / a * shift + d / a) / 2
+    disc = q2 * q2 + p3 * p3 * p3
+    if disc >= 0:
+        # Cardano's formula, with the cube roots combined without cancellation
+        u = np.cbrt(-q2 - math.copysign(math.sqrt(disc), q2))
+        y = u - p3 / u if u != 0 else 0.0
+    else:
+        # Three real roots (p < 0), use trigonometric solution
+        r = math.sqrt(-p3)
+        phi = math.acos(min(max(-q2 / (r * r * r), -1.0), 1.0)) / 3
+        # Pick the root of largest magnitude: phi <= pi/6 when q2 <= 0,
+        # otherwise the largest root is the negative one
+        if q2 > 0:
+            phi += 2 * math.pi / 3
+        y = 2 * r * math.cos(phi)
+    x = _polish_cubic_root(a, b, c, d, y - shift)
+    # Divide out (x - root) to get a.x^2 + e.x + f. Deflation from the highest
+    # power is stable for small roots, from the constant term for large ones,
+    # use the one with smaller relative remainder.
+    e_fwd = b + a * x
+    f_fwd = c + e_fwd * x
+    f_bwd = -d / x if x != 0 else c
+    e_bwd = (f_bwd - c) / x if x != 0 else b
+    rem_fwd = abs(d + f_fwd * x) / (abs(d) + abs(f_fwd * x) + 1e-300)
+    rem_bwd = abs(b - e_bwd + a * x) / (abs(b) + abs(e_bwd) + abs(a * x) + 1e-300)
+    e, f = (e_fwd, f_fwd) if rem_fwd <= rem_bwd else (e_bwd, f_bwd)
+    disc = e * e - 4 * a * f
+    if disc < 0:
+        if disc < -1e-12 * e * e:
+            return 1, x, 0.0, 0.0
+        # Within rounding error of zero, this is a double root
+        r0 = _polish_cubic_root(a, b, c, d, -0.5 * e / a)
+        return 3, x, r0, r0
+    _, r0, r1 = _solve_quadratic(a, e, f)
+    return (3, x, _polish_cubic_root(a, b, c, d, r0),
+            _polish_cubic_root(a, b, c, d, r1))
+
+
+@njit("UniTuple(float64, 2)(float64[::1], float64)", cache=True, fastmath=True)
+def _poly_eval(c, t):
+    """Evaluate polynomial and its derivative at `t` (Horner's scheme).
+
+    Coefficients in `c` are ordered from the lowest power.
+
+    """
+    y = 0.0
+    dy = 0.0
+    for i in range(len(c) - 1, -1, -1):
+        dy = dy * t + y
+        y = y * t + c[i]
+    return y, dy
+
+
+@njit("float64(float64[::1], float64, float64)", cache=True, fastmath=True)
+def _poly_root(c, lo, hi):
+    """Find root of polynomial in interval where it changes sign.
+
+    Newton's method, falling back to bisection whenever a step
+    would leave the bracket.
+
+    """
+    y_lo = _poly_eval(c, lo)[0]
+    y_hi = _poly_eval(c, hi)[0]
+    if y_lo == 0.0:
+        return lo
+    if y_hi == 0.0:
+        return hi
+    # Keep the bracket as (neg, pos) by sign of the polynomial
+    neg, pos = (lo, hi) if y_lo < 0.0 else (hi, lo)
+    t = 0.5 * (lo + hi)
+    for _ in range(100):
+        y, dy = _poly_eval(c, t)
+        if y == 0.0:
+            return t
+        if y < 0.0:
+            neg = t
+        else:
+            pos = t
+        t_next = t - y / dy if dy != 0.0 else neg
+        if (t_next - neg) * (t_next - pos) >= 0.0:
+            t_next = 0.5 * (neg + pos)
+        if abs(t_next - t) <= 1e-12:
+            return t_next
+        t = t_next
+    return t
+
+
+@njit("float64[::1](float64[::1])", cache=True, fastmath=True)
+def _poly_derivative(c):
+    """Coefficients of derivative of polynomial, ordered from the lowest power."""
+    return np.arange(1, len(c)) * c[1:]
+
+
+@njit("float64[::1](float64[::1], float64[::1])", cache=True, fastmath=True)
+def _bracketed_roots(c, bounds):
+    """Find roots of polynomial in the intervals between consecutive `bounds`.
+
+    The polynomial must be monotone in each interval, so that it has
+    at most one root there.
+
+    """
+    roots = np.empty(len(bounds) - 1)
+    n = 0
+    y_prev = _poly_eval(c, bounds[0])[0]
+    for i in range(1, len(bounds)):
+        y = _poly_eval(c, bounds[i])[0]
+        if y_prev * y <= 0.0:
+            roots[n] = _poly_root(c, bounds[i - 1], bounds[i])
+            n += 1
+        y_prev = y
+    return roots[:n]
 
 
 def solve_cubic(a, b, c, d):
@@ -45,84 +282,177 @@ def solve_cubic(a, b, c, d):
 
     a.x^3 + b.x^2 + c.x + d = 0
 
+    Stays accurate with a tiny leading coefficient:
+
+    >>> np.allclose(sorted(solve_cubic(1e-8, 1, -3, 2)), np.sort(np.roots([1e-8, 1, -3, 2])))
+    True
+
+    """
+    n, *roots = _solve_cubic(a, b, c, d)
+    return roots[:n]
+
+
+def de_casteljau(t, points):
+    """Evaluate bézier curve of any degree at `t`.
+
+    De Casteljau's algorithm: replace the control polygon by points
+    interpolated at `t` on each of its sides, until single point remains.
+
     """
-    return [r.real for r in np.poly1d([a, b, c, d]).r if r.imag == 0]
+    while len(points) > 1:
+        points = [(a[0] + t*(b[0] - a[0]), a[1] + t*(b[1] - a[1]))
+                  for a, b in zip(points, points[1:])]
+    return points[0]
+
+
+def hodograph(points):
+    """Control points of derivative of bézier curve."""
+    n = len(points) - 1
+    return [(n*(b[0] - a[0]), n*(b[1] - a[1])) for a, b in zip(points, points[1:])]
 
 
 def quadratic_bezier(t, p0, p1, p2):
-    p0, p1, p2 = map(np.array, [p0, p1, p2])
-    tc = 1 - t
-    return tc*tc*p0 + 2*tc*t*p1 + t*t*p2
+    return de_casteljau(t, [p0, p1, p2])
 
 
 def cubic_bezier(t, p0, p1, p2, p3):
-    p0, p1, p2, p3 = map(np.array, [p0, p1, p2, p3])
-    tc = 1 - t
-    return tc*tc*tc*p0 + 3*tc*tc*t*p1 + 3*tc*t*t*p2 + t*t*t*p3
+    return de_casteljau(t, [p0, p1, p2, p3])
 
 
 def quadratic_derivative(t, p0, p1, p2):
-    p0, p1, p2 = map(np.array, [p0, p1, p2])
-    tc = 1 - t
-    return 2*tc*(p1 - p0) + 2*t*(p2 - p1)
+    return de_casteljau(t, hodograph([p0, p1, p2]))
 
 
 def cubic_derivative(t, p0, p1, p2, p3):
-    p0, p1, p2, p3 = map(np.array, [p0, p1, p2, p3])
-    tc = 1 - t
-    return 3*tc*tc*(p1 - p0) + 6*tc*t*(p2 - p1) + 3*t*t*(p3 - p2)
-
-
-def line_distance(p, p0, p1):
-    p, p0, p1 = map(np.array, [p, p0, p1])
-    m = p - p0
-    a = p1 - p0
-    t = m.dot(a) / a.dot(a)
-    t = min(max(t, 0), 1)
-    x = p0 + t * a
-    # Determinant of this 2x2 matrix gives us orientation
+    return de_casteljau(t, hodograph([p0, p1, p2, p3]))
+
+
+@njit("UniTuple(float64, 4)(float64, float64, float64, float64, float64, float64)",
+      cache=True, fastmath=True)
+def _line_distance(px, py, p0x, p0y, p1x, p1y):
+    mx, my = px - p0x, py - p0y
+    ax, ay = p1x - p0x, p1y - p0y
+    aa = ax*ax + ay*ay
+    t = (mx*ax + my*ay) / aa if aa > 0 else 0.0
+    # Clamp to the segment, written so that JIT emits conditional moves
+    t = 0.0 if t < 0.0 else (1.0 if t > 1.0 else t)
+    xx, xy = p0x + t*ax, p0y + t*ay
+    # Determinant of 2x2 matrix [m, a] gives us orientation
     # of the two vectors. When clockwise rotation from p-p0 to p1-p0
     # takes less than 180°, the sign is positive, otherwise negative.
     # Note that in 3D, this is how we compute Z component of cross product
     # of two vectors.
-    side = la.det([m, a])
-    dist = math.copysign(la.norm(x - p), side)
-    return dist, x, t
+    side = mx*ay - my*ax
+    dist = math.copysign(math.hypot(xx - px, xy - py), side)
+    return dist, xx, xy, t
 
 
-def quadratic_distance(p, p0, p1, p2):
-    p, p0, p1, p2 = map(np.array, [p, p0, p1, p2])
-    m = p0 - p
-    a = p1 - p0
-    b = p2 - p1 - a
-    roots = solve_cubic(b.dot(b),
-                        3*a.dot(b),
-                        2*a.dot(a) + m.dot(b),
-                        m.dot(a))
-    # Find nearest point
-    dist_min = None
-    x_point = None
-    x_t = None
-    for t, x in [(0.0, p0), (1.0, p2)]:
-        dist = la.norm(x - p)
-        if dist_min is None or dist < dist_min:
-            dist_min = dist
-            x_point = x
-            x_t = t
-    for t in roots:
+def line_distance(p, p0, p1):
+    dist, xx, xy, t = _line_distance(p[0], p[1], p0[0], p0[1], p1[0], p1[1])
+    return dist, (xx, xy), t
+
+
+@njit("UniTuple(float64, 4)(float64, float64, float64, float64, "
+      "float64, float64, float64, float64)", cache=True, fastmath=True)
+def _quadratic_distance(px, py, p0x, p0y, p1x, p1y, p2x, p2y):
+    mx, my = p0x - px, p0y - py
+    # B(t) = b.t^2 + 2a.t + p0
+    ax, ay = p1x - p0x, p1y - p0y
+    bx, by = p2x - p1x - ax, p2y - p1y - ay
+    # Coefficients cancel only up to rounding, compare with the coordinates
+    eps = 1e-12 * (abs(p0x) + abs(p0y) + abs(p1x) + abs(p1y) + abs(p2x) + abs(p2y))
+    if abs(bx) <= eps and abs(by) <= eps:
+        # P1 is in the middle of P0, P2 - the curve is a line segment
+        return _line_distance(px, py, p0x, p0y, p2x, p2y)
+    _, r0, r1, r2 = _solve_cubic(bx*bx + by*by,
+                                 3*(ax*bx + ay*by),
+                                 2*(ax*ax + ay*ay) + mx*bx + my*by,
+                                 mx*ax + my*ay)
+    # Find nearest point in the candidates: the roots and the end points
+    # (unused root slots are zero, which is the starting end point)
+    x_t, xx, xy = 0.0, p0x, p0y
+    dist_min = math.hypot(mx, my)
+    for t in (r0, r1, r2, 1.0):
         if t < 0.0 or t > 1.0:
             continue
-        x = quadratic_bezier(t, p0, p1, p2)
-        dist = la.norm(x - p)
-        if dist_min is None or dist < dist_min:
+        ux = (bx*t + 2*ax)*t + p0x
+        uy = (by*t + 2*ay)*t + p0y
+        dist = math.hypot(ux - px, uy - py)
+        if dist < dist_min:
             dist_min = dist
-            x_point = x
-            x_t = t
+            x_t, xx, xy = t, ux, uy
     # Determine sign
-    direction = quadratic_derivative(x_t, p0, p1, p2)
-    side = la.det([p - x_point, direction])
+    dx, dy = 2*(bx*x_t + ax), 2*(by*x_t + ay)
+    side = (px - xx)*dy - (py - xy)*dx
     dist = math.copysign(dist_min, side)
-    return dist, x_point, x_t
+    return dist, xx, xy, x_t
+
+
+def quadratic_distance(p, p0, p1, p2):
+    """Find distance from a point to quadratic bézier curve.
+
+    Returns signed distance, the nearest point on the curve and its parameter.
+    A curve with P1 just off the middle of P0, P2 is still (nearly) a line:
+
+    >>> p, p0, p2 = (161.5, 404.9), (120.0, 260.0), (500.0, 520.0)
+    >>> dist, x, t = quadratic_distance(p, p0, (310.0 + 1e-8, 390.0), p2)
+    >>> line_dist, line_x, line_t = line_distance(p, p0, p2)
+    >>> math.isclose(dist, line_dist, abs_tol=1e-6) and math.isclose(t, line_t, abs_tol=1e-6)
+    True
+
+    """
+    dist, xx, xy, t = _quadratic_distance(p[0], p[1], p0[0], p0[1],
+                                          p1[0], p1[1], p2[0], p2[1])
+    return dist, (xx, xy), t
+
+
+@njit("UniTuple(float64, 4)(float64, float64, float64, float64, float64, "
+      "float64, float64, float64, float64, float64)", cache=True, fastmath=True)
+def _cubic_distance(px, py, p0x, p0y, p1x, p1y, p2x, p2y, p3x, p3y):
+    # B(t) = a.t^3 + b.t^2 + c.t + p0
+    ax, ay = p3x - 3*p2x + 3*p1x - p0x, p3y - 3*p2y + 3*p1y - p0y
+    bx, by = 3*(p2x - 2*p1x + p0x), 3*(p2y - 2*p1y + p0y)
+    cx, cy = 3*(p1x - p0x), 3*(p1y - p0y)
+    eps = 1e-12 * (abs(p0x) + abs(p0y) + abs(p1x) + abs(p1y) +
+                   abs(p2x) + abs(p2y) + abs(p3x) + abs(p3y))
+    if abs(ax) <= eps and abs(ay) <= eps:
+        # The curve is a degree-elevated quadratic
+        return _quadratic_distance(px, py, p0x, p0y, (3*p1x - p0x) / 2, (3*p1y - p0y) / 2,
+                                   p3x, p3y)
+    qx, qy = p0x - px, p0y - py
+    # PX.B'(t) = (a.t^3 + b.t^2 + c.t + q).(3a.t^2 + 2b.t + c)
+    coeffs = np.array((qx*cx + qy*cy,
+                       cx*cx + cy*cy + 2*(qx*bx + qy*by),
+                       3*(bx*cx + by*cy + ax*qx + ay*qy),
+                       4*(ax*cx + ay*cy) + 2*(bx*bx + by*by),
+                       5*(ax*bx + ay*by),
+                       3*(ax*ax + ay*ay)))
+    # Isolate the roots using derivatives: roots of 2nd derivative (a cubic)
+    # split t to intervals where 1st derivative is monotone, so each contains
+    # at most one of its roots. These in turn split t to intervals where
+    # the polynomial is monotone.
+    d1 = _poly_derivative(coeffs)
+    d2 = _poly_derivative(d1)
+    n, r0, r1, r2 = _solve_cubic(d2[3], d2[2], d2[1], d2[0])
+    crit = np.array((r0, r1, r2))[:n]
+    crit = np.sort(crit[(crit > 0.0) & (crit < 1.0)])
+    bounds = np.concatenate((np.zeros(1), crit, np.ones(1)))
+    bounds = np.concatenate((np.zeros(1), _bracketed_roots(d1, bounds), np.ones(1)))
+    # Find nearest point in the candidates: the roots and the end points
+    x_t, xx, xy = 0.0, p0x, p0y
+    dist_min = math.hypot(qx, qy)
+    for t in np.append(_bracketed_roots(coeffs, bounds), 1.0):
+        ux = ((ax*t + bx)*t + cx)*t + p0x
+        uy = ((ay*t + by)*t + cy)*t + p0y
+        dist = math.hypot(ux - px, uy - py)
+        if dist < dist_min:
+            dist_min = dist
+            x_t, xx, xy = t, ux, uy
+    # Determine sign
+    dx, dy = (3*ax*x_t + 2*bx)*x_t + cx, (3*ay*x_t + 2*by)*x_t + cy
+    side = (px - xx)*dy - (py - xy)*dx
+    dist = math.copysign(dist_min, side)
+    return dist, xx, xy, x_t
 
 
 def cubic_distance(p, p0, p1, p2, p3):
@@ -136,38 +466,12 @@ def cubic_distance(p, p0, p1, p2, p3):
     PX is a vector pointing towards query point (normal vector)
     B'(t) is derivative function, which gives tangent vector at point X.
     Dot product of these two vectors must be zero (vectors are perpendicular).
+    Expanded in powers of t, this is a polynomial equation of 5th degree.
 
     """
-    p, p0, p1, p2, p3 = map(np.array, [p, p0, p1, p2, p3])
-    def f(t):
-        return (cubic_bezier(t, p0, p1, p2, p3) - p).dot(cubic_derivative(t, p0, p1, p2, p3))
-    # Partition t to `steps` intervals and solve the equation for each interval
-    steps = 15
-    bounds = [t / steps for t in range(0, steps + 1)]
-    candidate_t = []
-    for a, b in ipairs(bounds):
-        try:
-            t = brentq(f, a, b)
-            candidate_t.append(t)
-        except ValueError:
-            # f(a) and f(b) must have different signs
-            pass
-    candidate_t += [0.0, 1.0]
-    # Find nearest point in the candidates
-    dist_min = None
-    x_point, x_t = None, None
-    for t in candidate_t:
-        x = cubic_bezier(t, p0, p1, p2, p3)
-        dist = la.norm(x - p)
-        if dist_min is None or dist < dist_min:
-            dist_min = dist
-            x_point = x
-            x_t = t
-    # Determine sign
-    direction = cubic_derivative(x_t, p0, p1, p2, p3)
-    side = la.det([p - x_point, direction])
-    dist = math.copysign(dist_min, side)
-    return dist, x_point, x_t
+    dist, xx, xy, t = _cubic_distance(p[0], p[1], p0[0], p0[1], p1[0], p1[1],
+                                      p2[0], p2[1], p3[0], p3[1])
+    return dist, (xx, xy), t
 
 
 def line_bbox(p0, p1):
@@ -181,7 +485,9 @@ def quadratic_bbox(p0, p1, p2):
     # Solve the derivative B'(t) = 0, for each coordinate x, y.
     # This gives us t_x, t_y. If these are in curve interval (0..1)
     # then we get at most two extrema points of the parabola.
+    # B(t) = d.t^2 + c.t + p0
     candidates = []
+    cx, cy = 2*(p1[0] - p0[0]), 2*(p1[1] - p0[1])
     dx = p0[0] - 2*p1[0] + p2[0]
     if dx != 0:
         candidates.append((p0[0] - p1[0]) / dx)
@@ -190,7 +496,7 @@ def quadratic_bbox(p0, p1, p2):
         candidates.append((p0[1] - p1[1]) / dy)
     for t in candidates:
         if 0 <= t <= 1:
-            p = quadratic_bezier(t, p0, p1, p2)
+            p = ((dx*t + cx)*t + p0[0], (dy*t + cy)*t + p0[1])
             extrema.append(p)
     xs = [p[0] for p in extrema]
     ys = [p[1] for p in extrema]
@@ -200,13 +506,14 @@ def quadratic_bbox(p0, p1, p2):
 
 
 def cubic_bbox(p0, p1, p2, p3):
-    p0, p1, p2, p3 = map(np.array, [p0, p1, p2, p3])
     extrema = [p0, p3]
-    a = p3 - 3*p2 + 3*p1 - p0
-    b = 2*(p2 - 2*p1 + p0)
-    c = p1 - p0
-    candidates = solve_quadratic(a[0], b[0], c[0])
-    candidates += solve_quadratic(a[1], b[1], c[1])
+    # Solve the derivative B'(t) = 0, for each coordinate x, y.
+    # B'(t) / 3 = a.t^2 + b.t + c
+    ax, ay = p3[0] - 3*p2[0] + 3*p1[0] - p0[0], p3[1] - 3*p2[1] + 3*p1[1] - p0[1]
+    bx, by = 2*(p2[0] - 2*p1[0] + p0[0]), 2*(p2[1] - 2*p1[1] + p0[1])
+    cx, cy = p1[0] - p0[0], p1[1] - p0[1]
+    candidates = solve_quadratic(ax, bx, cx)
+    candidates += solve_quadratic(ay, by, cy)
     for t in candidates:
         if 0 <= t <= 1:
             p = cubic_bezier(t, p0, p1, p2, p3)
@@ -249,11 +556,14 @@ class App:
                        (WIDTH * 0.8, HEIGHT * 0.8)]  # P3
         self.result = (None, None, None)
         self.show_bbox = False
+        self.curve_buffer = np.empty((SMOOTHNESS + 1, 2))
         self.recreate_points()
+        self.recreate_lines()
         self.refresh()
 
         self.moving = None
         self.scrolling = False
+        self.refresh_pending = False
 
     def main(self):
         tk.mainloop()
@@ -283,31 +593,49 @@ class App:
     def on_move(self, event):
         if self.moving is not None:
             item = self.moving
-            idx = self.canvas.find_withtag("point").index(item)
+            idx = self.point_index[item]
             x, y = self.points[idx]
             rx = self.canvas.canvasx(event.x) - x
             ry = self.canvas.canvasy(event.y) - y
-            self.canvas.move(item, rx, ry)
-            self.points[idx] = (x + rx, y + ry)
-            self.refresh()
+            if rx or ry:
+                self.canvas.move(item, rx, ry)
+                self.points[idx] = (x + rx, y + ry)
+                self.schedule_refresh()
         if self.scrolling:
             self.canvas.scan_dragto(event.x, event.y, 1)
 
+    def on_idle(self):
+        self.refresh_pending = False
+        self.refresh()
+
+    def schedule_refresh(self):
+        """Refresh when Tk gets idle.
+
+        This coalesces a burst of motion events into a single refresh.
+
+        """
+        if not self.refresh_pending:
+            self.refresh_pending = True
+            self.canvas.after_idle(self.on_idle)
+
     def on_key_plus(self, _event):
         if self.level < 3:
             self.level += 1
             self.recreate_points()
+            self.recreate_lines()
             self.refresh()
 
     def on_key_minus(self, _event):
         if self.level > 1:
             self.level -= 1
             self.recreate_points()
+            self.recreate_lines()
             self.refresh()
 
     def on_key_bbox(self, _event):
         self.show_bbox = not self.show_bbox
-        self.refresh()
+        self.canvas.itemconfigure(self.bbox_item, state=self.bbox_state())
+        self.refresh_bbox(self.points[1:self.level+2])
 
     def on_key_dump(self, _event):
         """Dump curve parameters to console"""
@@ -322,44 +650,66 @@ class App:
         colors = ["red", "green", "blue", "blue", None]
         colors[self.level+1] = "#909"
         radius = 3
-        for p, color in zip(self.points[:self.level+2], colors):
+        self.point_index = {}
+        for idx, (p, color) in enumerate(zip(self.points[:self.level+2], colors)):
             coords = (p[0] - radius, p[1] - radius, p[0] + radius, p[1] + radius)
-            self.canvas.create_oval(coords, fill=color, outline="white", tag="point")
+            item = self.canvas.create_oval(coords, fill=color, outline="white", tag="point")
+            self.point_index[item] = idx
 
-    def refresh(self):
-        self.canvas.delete("line")
-        points = self.points[1:self.level+2]
+    def bbox_state(self):
+        return tk.NORMAL if self.show_bbox else tk.HIDDEN
 
-        # Draw bbox
-        if self.show_bbox:
-            bbox_func = {1: line_bbox, 2: quadratic_bbox, 3: cubic_bbox}[self.level]
-            bb_lt, bb_rb = bbox_func(*points)
-            bb_rt = bb_rb[0], bb_lt[1]
-            bb_lb = bb_lt[0], bb_rb[1]
-            self.canvas.create_line(bb_lt, bb_rt, bb_rb, bb_lb, bb_lt,
-                                    width=1, fill="blue", tag="line")
+    def recreate_lines(self):
+        self.canvas.delete("line")
+        self.bbox_item = self.canvas.create_line(0, 0, 0, 0, width=1, fill="blue",
+                                                 state=self.bbox_state(), tag="line")
+        self.polygon_item = None
+        if self.level > 1:
+            self.polygon_item = self.canvas.create_line(0, 0, 0, 0, width=1, fill="black", tag="line")
+        self.curve_item = self.canvas.create_line(0, 0, 0, 0, width=2, fill="white", tag="line")
+        self.distance_item = self.canvas.create_line(0, 0, 0, 0, width=2, fill="yellow",
+                                                     dash=(3,5), tag="line")
+        # Bring points to front (above lines)
+        self.canvas.tag_raise("point", "line")
+        self.curve_points = None
+        self.bbox_points = None
 
+    def refresh(self):
+        points = self.points[1:self.level+2]
+        self.refresh_bbox(points)
+        self.refresh_curve(points)
+        self.refresh_distance(points)
+
+    def refresh_bbox(self, points):
+        """Update bbox, only when shown and the curve has changed"""
+        if not self.show_bbox or points == self.bbox_points:
+            return
+        self.bbox_points = points
+        bbox_func = {1: line_bbox, 2: quadratic_bbox, 3: cubic_bbox}[self.level]
+        bb_lt, bb_rb = bbox_func(*points)
+        bb_rt = bb_rb[0], bb_lt[1]
+        bb_lb = bb_lt[0], bb_rb[1]
+        self.canvas.coords(self.bbox_item, bb_lt, bb_rt, bb_rb, bb_lb, bb_lt)
+
+    def refresh_curve(self, points):
+        """Redraw the curve, only when its points have changed"""
+        if points == self.curve_points:
+            return
+        self.curve_points = points
         if self.level == 1:
-            self.canvas.create_line(points, width=2, fill="white", tag="line")
+            self.canvas.coords(self.curve_item, points)
         else:
-            self.canvas.create_line(points, width=1, fill="black", tag="line")
-            curve_func = {2: quadratic_bezier, 3: cubic_bezier}[self.level]
-            smoothness = 100
-            start = points[0]
-            for t in range(1, smoothness + 1):
-                imp = curve_func(t / smoothness, *points)
-                self.canvas.create_line(list(start), list(imp), width=2, fill="white", tag="line")
-                start = imp
+            self.canvas.coords(self.polygon_item, points)
+            curve = bezier_polyline(points, SMOOTHNESS, self.curve_buffer)
+            self.canvas.coords(self.curve_item, curve.ravel().tolist())
 
+    def refresh_distance(self, points):
         px = self.points[0]
         dist_func = {1: line_distance, 2: quadratic_distance, 3: cubic_distance}[self.level]
-        self.result = dist_func(px, *self.points[1:self.level+2])
+        self.result = dist_func(px, *points)
         dist, x, _t = self.result
         self.label_dist.config(text="%s distance: %.2f" % (LEVEL_NAME[self.level], dist))
-        self.canvas.create_line(list(x), px, width=2, fill="yellow", dash=(3,5), tag="line")
-
-        # Bring points to front (above lines)
-        self.canvas.tag_raise("point", "line")
+        self.canvas.coords(self.distance_item, list(x), px)
 
 
 if __name__ == '__main__':